@@ -0,0 +1,243 @@
+# @title Question Bank
+# Lives in its own module so Streamlit imports it once per server process
+# instead of rebuilding it on every script rerun.
+import sys
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Sequence
+
+_ANSWER_STRIP_TABLE = str.maketrans('', '', ' -\t\n\r')
+
+def normalize_answer(name):
+    # Case-insensitive, ignoring spaces and hyphens, in one pass over the string
+    return name.casefold().translate(_ANSWER_STRIP_TABLE)
+
+_NO_ERRORS = MappingProxyType({})
+
+
+class Problem(NamedTuple):
+    smiles: str
+    name: str
+    condensed: str
+    category: str
+    difficulty: str
+    alternative_names: Sequence[str] = ()
+    common_errors: Sequence[dict] = () # [{"incorrect_name": ..., "explanation": ...}, ...]
+    normalized_errors: Mapping[str, str] = _NO_ERRORS # normalize_answer(incorrect_name) -> explanation
+    normalized_name: str = "" # normalize_answer(name)
+    normalized_alternative_names: frozenset = frozenset() # normalize_answer() of each alternative name
+
+
+_RAW_PRACTICE_PROBLEMS = [
+    # === Straight-chain Alkane ===
+    {"smiles": "C", "name": "methane", "condensed": "CH4", "category": "Straight-chain Alkane", "difficulty": "Easy"},
+    {"smiles": "CC", "name": "ethane", "condensed": "CH3CH3", "category": "Straight-chain Alkane", "difficulty": "Easy"},
+    {"smiles": "CCC", "name": "propane", "condensed": "CH3CH2CH3", "category": "Straight-chain Alkane", "difficulty": "Easy"},
+    {"smiles": "CCCC", "name": "butane", "condensed": "CH3CH2CH2CH3", "category": "Straight-chain Alkane", "difficulty": "Medium"},
+    {"smiles": "CCCCC", "name": "pentane", "condensed": "CH3(CH2)3CH3", "category": "Straight-chain Alkane", "difficulty": "Medium"},
+    {"smiles": "CCCCCC", "name": "hexane", "condensed": "CH3(CH2)4CH3", "category": "Straight-chain Alkane", "difficulty": "Medium"},
+    {"smiles": "CCCCCCC", "name": "heptane", "condensed": "CH3(CH2)5CH3", "category": "Straight-chain Alkane", "difficulty": "Hard"},
+    {"smiles": "CCCCCCCC", "name": "octane", "condensed": "CH3(CH2)6CH3", "category": "Straight-chain Alkane", "difficulty": "Hard"},
+
+    # === Branched Alkane ===
+    {"smiles": "CC(C)C", "name": "2-methylpropane", "condensed": "CH3CH(CH3)CH3", "category": "Branched Alkane", "difficulty": "Easy", "alternative_names": ["methylpropane"]},
+    {"smiles": "CC(C)CC", "name": "2-methylbutane", "condensed": "CH3CH(CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
+    {"smiles": "CCC(C)CC", "name": "3-methylpentane", "condensed": "CH3CH2CH(CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
+    {"smiles": "CC(C)(C)C", "name": "2,2-dimethylpropane", "condensed": "C(CH3)4", "category": "Branched Alkane", "difficulty": "Medium"},
+    {"smiles": "CC(C)CCC", "name": "2-methylpentane", "condensed": "CH3CH(CH3)CH2CH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
+    {"smiles": "CC(C)C(C)C", "name": "2,3-dimethylbutane", "condensed": "CH3CH(CH3)CH(CH3)CH3", "category": "Branched Alkane", "difficulty": "Hard"},
+    {"smiles": "CCC(C)(C)CC", "name": "3,3-dimethylpentane", "condensed": "CH3CH2C(CH3)2CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
+    {"smiles": "CC(C)CC(C)C", "name": "2,4-dimethylpentane", "condensed": "CH3CH(CH3)CH2CH(CH3)CH3", "category": "Branched Alkane", "difficulty": "Hard"},
+    {"smiles": "CCC(CC)CCC", "name": "3-ethylhexane", "condensed": "CH3CH2CH2CH(CH2CH3)CH2CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
+    {"smiles": "CC(C)(C)CC(C)C", "name": "2,2,4-trimethylpentane", "condensed": "(CH3)3CCH2CH(CH3)CH3", "category": "Branched Alkane", "difficulty": "Hard"},
+    # === Branched Alkane (Continued) ===
+    {"smiles": "CC(C)(C)CC", "name": "2,2-dimethylbutane", "condensed": "(CH3)3CCH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
+    {"smiles": "CC(C)C(C)CC", "name": "2,3-dimethylpentane", "condensed": "CH3CH(CH3)CH(CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
+    {"smiles": "CCC(CC)CC", "name": "3-ethylpentane", "condensed": "CH3CH2CH(CH2CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
+    {"smiles": "CC(C)C(CC)CC", "name": "3-ethyl-2-methylpentane", "condensed": "CH3CH(CH3)CH(CH2CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
+    {"smiles": "CCC(C)(C)C(CC)CCC", "name": "4-ethyl-3,3-dimethylheptane", "condensed": "CH3CH2C(CH3)2CH(CH2CH3)CH2CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
+
+    # === Alkene === (Includes straight and branched)
+    {"smiles": "C=C", "name": "ethene", "condensed": "CH2=CH2", "category": "Alkene", "difficulty": "Easy"},
+    {"smiles": "CC=C", "name": "propene", "condensed": "CH3CH=CH2", "category": "Alkene", "difficulty": "Easy"},
+    {"smiles": "C=CCC", "name": "but-1-ene", "condensed": "CH2=CHCH2CH3", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "CC=CC", "name": "but-2-ene", "condensed": "CH3CH=CHCH3", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "C=CCCC", "name": "pent-1-ene", "condensed": "CH2=CHCH2CH2CH3", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "CC=CCC", "name": "pent-2-ene", "condensed": "CH3CH=CHCH2CH3", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "CC(C)C=C", "name": "3-methylbut-1-ene", "condensed": "CH3CH(CH3)CH=CH2", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "C=C(C)CC", "name": "2-methylbut-1-ene", "condensed": "CH2=C(CH3)CH2CH3", "category": "Alkene", "difficulty": "Hard"},
+    {"smiles": "CC=C(C)C", "name": "2-methylbut-2-ene", "condensed": "CH3CH=C(CH3)CH3", "category": "Alkene", "difficulty": "Hard"},
+    {"smiles": "CCC(C)=CCC", "name": "3-methylhex-3-ene", "condensed": "CH3CH2C(CH3)=CHCH2CH3", "category": "Alkene", "difficulty": "Hard"},
+    
+    # === Alkene (Continued) ===
+    {"smiles": "C=CCCCC", "name": "hex-1-ene", "condensed": "CH2=CHCH2CH2CH2CH3", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "CC=CCCC", "name": "hex-2-ene", "condensed": "CH3CH=CHCH2CH2CH3", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "CCC=CCC", "name": "hex-3-ene", "condensed": "CH3CH2CH=CHCH2CH3", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "C=CC(C)CC", "name": "3-methylpent-1-ene", "condensed": "CH2=CHCH(CH3)CH2CH3", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "CC=CC(C)C", "name": "4-methylpent-2-ene", "condensed": "CH3CH=CHCH(CH3)CH3", "category": "Alkene", "difficulty": "Medium"}, # Note: Could be (E) or (Z)
+    {"smiles": "CC(C)=C(C)C", "name": "2,3-dimethylbut-2-ene", "condensed": "CH3C(CH3)=C(CH3)CH3", "category": "Alkene", "difficulty": "Hard"},
+    
+    # Dienes
+    {"smiles": "C=CC=C", "name": "buta-1,3-diene", "condensed": "CH2=CHCH=CH2", "category": "Alkene", "difficulty": "Medium"},
+    {"smiles": "C=CC=CC", "name": "penta-1,3-diene", "condensed": "CH2=CHCH=CHCH3", "category": "Alkene", "difficulty": "Hard"}, # Note: CH3 end can be E/Z
+    {"smiles": "C=CCC=C", "name": "penta-1,4-diene", "condensed": "CH2=CHCH2CH=CH2", "category": "Alkene", "difficulty": "Hard"},
+    {"smiles": "C=C(C)C=C", "name": "2-methylbuta-1,3-diene", "condensed": "CH2=C(CH3)CH=CH2", "category": "Alkene", "difficulty": "Hard", "alternative_names": ["isoprene"]},
+    
+    # === Haloalkane ===
+    {"smiles": "C(Cl)", "name": "chloromethane", "condensed": "CH3Cl", "category": "Haloalkane", "difficulty": "Easy"},
+    {"smiles": "CCBr", "name": "bromoethane", "condensed": "CH3CH2Br", "category": "Haloalkane", "difficulty": "Easy"},
+    {"smiles": "CI", "name": "iodomethane", "condensed": "CH3I", "category": "Haloalkane", "difficulty": "Easy"}, # Added Iodo
+    {"smiles": "CF", "name": "fluoromethane", "condensed": "CH3F", "category": "Haloalkane", "difficulty": "Easy"},
+    {"smiles": "CCCI", "name": "1-iodopropane", "condensed": "CH3CH2CH2I", "category": "Haloalkane", "difficulty": "Medium"}, # Added Iodo
+    {"smiles": "CC(I)C", "name": "2-iodopropane", "condensed": "CH3CHICH3", "category": "Haloalkane", "difficulty": "Medium"}, # Added Iodo
+    {"smiles": "CCCCl", "name": "1-chloropropane", "condensed": "CH3CH2CH2Cl", "category": "Haloalkane", "difficulty": "Medium"},
+    {"smiles": "CC(Cl)C", "name": "2-chloropropane", "condensed": "CH3CHClCH3", "category": "Haloalkane", "difficulty": "Medium"},
+    {"smiles": "C(F)(F)F", "name": "trifluoromethane", "condensed": "CHF3", "category": "Haloalkane", "difficulty": "Medium"},
+    {"smiles": "CC(Br)CC", "name": "2-bromobutane", "condensed": "CH3CHBrCH2CH3", "category": "Haloalkane", "difficulty": "Medium"},
+    {"smiles": "ClCCBr", "name": "1-bromo-2-chloroethane", "condensed": "ClCH2CH2Br", "category": "Haloalkane", "difficulty": "Hard"},
+    {"smiles": "CC(Cl)(I)C", "name": "2-chloro-2-iodopropane", "condensed": "CH3C(Cl)(I)CH3", "category": "Haloalkane", "difficulty": "Hard"}, # Added Iodo
+    {"smiles": "FC(Cl)I", "name": "chlorofluoroiodomethane", "condensed": "CHFClI", "category": "Haloalkane", "difficulty": "Hard"}, # Added Iodo
+    
+    # === Haloalkane (Continued) ===
+    {"smiles": "CC(C)CBr", "name": "1-bromo-2-methylpropane", "condensed": "CH3CH(CH3)CH2Br", "category": "Haloalkane", "difficulty": "Medium"},
+    {"smiles": "CC(Cl)C(C)C", "name": "2-chloro-3-methylbutane", "condensed": "CH3CH(Cl)CH(CH3)CH3", "category": "Haloalkane", "difficulty": "Hard"},
+    {"smiles": "ClCC(C)(C)C", "name": "1-chloro-2,2-dimethylpropane", "condensed": "ClCH2C(CH3)3", "category": "Haloalkane", "difficulty": "Hard"},
+    {"smiles": "FC(Br)(Cl)C", "name": "1-bromo-1-chloro-1-fluoroethane", "condensed": "CH3CBrClF", "category": "Haloalkane", "difficulty": "Hard"}, # Halogens listed alphabetically
+    {"smiles": "CC(F)C(Cl)C", "name": "2-chloro-3-fluorobutane", "condensed": "CH3CH(F)CH(Cl)CH3", "category": "Haloalkane", "difficulty": "Hard"}, # Alphabetical chloro, then fluoro
+    
+    # === Alkanol ===
+    {"smiles": "CO", "name": "methanol", "condensed": "CH3OH", "category": "Alkanol", "difficulty": "Easy"},
+    {"smiles": "CCO", "name": "ethanol", "condensed": "CH3CH2OH", "category": "Alkanol", "difficulty": "Easy"},
+    {"smiles": "CCCO", "name": "propan-1-ol", "condensed": "CH3CH2CH2OH", "category": "Alkanol", "difficulty": "Medium"},
+    {"smiles": "CC(O)C", "name": "propan-2-ol", "condensed": "CH3CH(OH)CH3", "category": "Alkanol", "difficulty": "Medium"},
+    {"smiles": "CCCCO", "name": "butan-1-ol", "condensed": "CH3CH2CH2CH2OH", "category": "Alkanol", "difficulty": "Medium"},
+    {"smiles": "CC(O)CC", "name": "butan-2-ol", "condensed": "CH3CH(OH)CH2CH3", "category": "Alkanol", "difficulty": "Medium"},
+    {"smiles": "CC(C)(O)C", "name": "2-methylpropan-2-ol", "condensed": "(CH3)3COH", "category": "Alkanol", "difficulty": "Hard","alternative_names": ["methylpropan-2-ol"]},
+    {"smiles": "CC(C)CO", "name": "2-methylpropan-1-ol", "condensed": "CH3CH(CH3)CH2OH", "category": "Alkanol", "difficulty": "Hard","alternative_names": ["methylpropan-1-ol"]},
+    {"smiles": "CCC(O)CC", "name": "pentan-3-ol", "condensed": "CH3CH2CH(OH)CH2CH3", "category": "Alkanol", "difficulty": "Hard"},
+    {"smiles": "CC(O)C(O)C", "name": "butane-2,3-diol", "condensed": "CH3CH(OH)CH(OH)CH3", "category": "Alkanol", "difficulty": "Hard"},
+    # === Alkanol (Continued) ===
+    {"smiles": "CCCCCCO", "name": "hexan-1-ol", "condensed": "CH3(CH2)4CH2OH", "category": "Alkanol", "difficulty": "Medium"},
+    {"smiles": "CCCC(O)CC", "name": "hexan-3-ol", "condensed": "CH3CH2CH2CH(OH)CH2CH3", "category": "Alkanol", "difficulty": "Medium"},
+    {"smiles": "CC(C)CCO", "name": "3-methylbutan-1-ol", "condensed": "CH3CH(CH3)CH2CH2OH", "category": "Alkanol", "difficulty": "Hard"},
+    {"smiles": "CC(O)C(C)C", "name": "3-methylbutan-2-ol", "condensed": "CH3CH(OH)CH(CH3)CH3", "category": "Alkanol", "difficulty": "Hard"},
+    {"smiles": "OCCCO", "name": "propane-1,3-diol", "condensed": "HOCH2CH2CH2OH", "category": "Alkanol", "difficulty": "Medium"},
+    {"smiles": "OCC(O)CO", "name": "propane-1,2,3-triol", "condensed": "HOCH2CH(OH)CH2OH", "category": "Alkanol", "difficulty": "Hard", "alternative_names": ["glycerol"]},
+
+    # === Carboxylic Acid ===
+    {"smiles": "C(=O)O", "name": "methanoic acid", "condensed": "HCOOH", "category": "Carboxylic Acid", "difficulty": "Easy"},
+    {"smiles": "CC(=O)O", "name": "ethanoic acid", "condensed": "CH3COOH", "category": "Carboxylic Acid", "difficulty": "Easy"},
+    {"smiles": "CCC(=O)O", "name": "propanoic acid", "condensed": "CH3CH2COOH", "category": "Carboxylic Acid", "difficulty": "Medium"},
+    {"smiles": "CCCC(=O)O", "name": "butanoic acid", "condensed": "CH3CH2CH2COOH", "category": "Carboxylic Acid", "difficulty": "Medium"},
+    {"smiles": "CC(C)C(=O)O", "name": "2-methylpropanoic acid", "condensed": "CH3CH(CH3)COOH", "category": "Carboxylic Acid", "difficulty": "Medium"},
+    {"smiles": "CCCCC(=O)O", "name": "pentanoic acid", "condensed": "CH3CH2CH2CH2COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
+    {"smiles": "CC(C)CC(=O)O", "name": "3-methylbutanoic acid", "condensed": "CH3CH(CH3)CH2COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
+    {"smiles": "C(C(=O)O)C(=O)O", "name": "propanedioic acid", "condensed": "HOOCCH2COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
+    {"smiles": "CC(Cl)C(=O)O", "name": "2-chloropropanoic acid", "condensed": "CH3CH(Cl)COOH", "category": "Carboxylic Acid", "difficulty": "Hard"}, # Also Mixed
+    # === Carboxylic Acid (Continued) ===
+    {"smiles": "CCCCCC(=O)O", "name": "hexanoic acid", "condensed": "CH3(CH2)4COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
+    {"smiles": "CCC(CC)C(=O)O", "name": "2-ethylbutanoic acid", "condensed": "CH3CH2CH(CH2CH3)COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
+    {"smiles": "CC(C)(C)C(=O)O", "name": "2,2-dimethylpropanoic acid", "condensed": "(CH3)3CCOOH", "category": "Carboxylic Acid", "difficulty": "Hard", "alternative_names": ["pivalic acid"]},
+    {"smiles": "O=C(O)CCC(=O)O", "name": "butanedioic acid", "condensed": "HOOC(CH2)2COOH", "category": "Carboxylic Acid", "difficulty": "Hard", "alternative_names": ["succinic acid"]},
+    {"smiles": "O=C(O)CCCC(=O)O", "name": "pentanedioic acid", "condensed": "HOOC(CH2)3COOH", "category": "Carboxylic Acid", "difficulty": "Hard", },
+    
+    # === Mixed Functional Groups === (Focusing on combinations taught in S4, avoiding primary ketones)
+    # Alkanol + Alkene
+    {"smiles": "CC(O)C=C", "name": "but-3-en-2-ol", "condensed": "CH2=CHCH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "C=CCCO", "name": "but-3-en-1-ol", "condensed": "CH2=CHCH2CH2OH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "CC=CC(O)C", "name": "pent-3-en-2-ol", "condensed": "CH3CH=CHCH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "C=C(C)CO", "name": "2-methylprop-2-en-1-ol", "condensed": "CH2=C(CH3)CH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+
+    # Alkanol + Haloalkane
+    {"smiles": "OCCBr", "name": "2-bromoethanol", "condensed": "HOCH2CH2Br", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "ClCC(O)C", "name": "1-chloropropan-2-ol", "condensed": "ClCH2CH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "CC(O)CI", "name": "1-iodopropan-2-ol", "condensed": "ICH2CH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Added iodo
+    {"smiles": "C=CC(Br)CO", "name": "2-bromobut-3-en-1-ol", "condensed": "CH2=CHCH(Br)CH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+
+    # Alkene + Haloalkane
+    {"smiles": "C=CCl", "name": "chloroethene", "condensed": "CH2=CHCl", "category": "Mixed Functional Groups", "difficulty": "Easy"},
+    {"smiles": "BrC=C", "name": "bromoethene", "condensed": "CHBr=CH2", "category": "Mixed Functional Groups", "difficulty": "Easy"},
+    {"smiles": "C=CI", "name": "iodoethene", "condensed": "CH2=CHI", "category": "Mixed Functional Groups", "difficulty": "Easy"}, # Added iodo
+    {"smiles": "ClC=CCl", "name": "1,2-dichloroethene", "condensed": "CHCl=CHCl", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "C=CCBr", "name": "3-bromoprop-1-ene", "condensed": "CH2=CHCH2Br", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    # Haloalkene (More examples)
+    {"smiles": "ClC=CCCl", "name": "1,3-dichloropropene", "condensed": "ClCH=CHCH2Cl", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Can be E/Z
+    {"smiles": "C=C(Br)CBr", "name": "2,3-dibromoprop-1-ene", "condensed": "CH2=C(Br)CH2Br", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+
+    # Carboxylic Acid + Alkene (Unsaturated Acids)
+    {"smiles": "C=CC(=O)O", "name": "propenoic acid", "condensed": "CH2=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "CC=CC(=O)O", "name": "but-2-enoic acid", "condensed": "CH3CH=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "C=C(C)C(=O)O", "name": "2-methylpropenoic acid", "condensed": "CH2=C(CH3)COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+
+    # Carboxylic Acid + Haloalkane (Halo Acids)
+    {"smiles": "ClCC(=O)O", "name": "chloroethanoic acid", "condensed": "ClCH2COOH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "BrCCC(=O)O", "name": "3-bromopropanoic acid", "condensed": "BrCH2CH2COOH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "CC(I)C(=O)O", "name": "2-iodopropanoic acid", "condensed": "CH3CH(I)COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Added iodo
+    {"smiles": "ClC(Cl)C(=O)O", "name": "2,2-dichloroethanoic acid", "condensed": "Cl2CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+
+    # Carboxylic Acid + Alkene + Halo
+    {"smiles": "ClC=CC(=O)O", "name": "3-chloropropenoic acid", "condensed": "ClCH=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard", "alternative_names": ["3-chloroprop-2-enoic acid"]}, # Can be E/Z
+    {"smiles": "C=C(Cl)C(=O)O", "name": "2-chloropropenoic acid", "condensed": "CH2=C(Cl)COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "BrCC=CC(=O)O", "name": "4-bromobut-2-enoic acid", "condensed": "BrCH2CH=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Can be E/Z
+
+    # Alkanol + Alkene + Halo (More examples)
+    {"smiles": "ClCC(O)C=C", "name": "1-chlorobut-3-en-2-ol", "condensed": "CH2=CHCH(OH)CH2Cl", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Typo in thought process, CH2=CHCH(OH)CH2Cl is correct for this name
+    {"smiles": "C=CCC(O)CI", "name": "5-iodopent-1-en-4-ol", "condensed": "CH2=CHCH2CH(OH)CH2I", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+
+    
+    # More challenging combinations without primary ketones
+    {"smiles": "ClC=CC(O)C", "name": "1-chlorobut-1-en-3-ol", "condensed": "ClCH=CHCH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "CC(Br)=CC(=O)O", "name": "3-bromobut-2-enoic acid", "condensed": "CH3C(Br)=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "OCC(Cl)C=C", "name": "2-chlorobut-3-en-1-ol", "condensed": "HOCH2CH(Cl)CH=CH2", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "C=C(Cl)C(C)(O)C", "name": "3-chloro-2-methylbut-3-en-2-ol", "condensed": "CH2=C(Cl)C(CH3)(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Corrected from before
+    {"smiles": "BrC(C)=CC(O)C", "name": "4-bromopent-3-en-2-ol", "condensed": "BrCH(CH3)CH=CHCH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+
+    # Additional Mixed Examples
+    {"smiles": "CCC(O)C=C", "name": "pent-1-en-3-ol", "condensed": "CH3CH2CH(OH)CH=CH2", "category": "Mixed Functional Groups", "difficulty": "Medium"},
+    {"smiles": "CC(Cl)C(O)CC", "name": "2-chloropentan-3-ol", "condensed": "CH3CH(Cl)CH(OH)CH2CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "C=C(Br)CCC(=O)O", "name": "4-bromopent-4-enoic acid", "condensed": "CH2=C(Br)CH2CH2COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "OCC=CCO", "name": "but-2-ene-1,4-diol", "condensed": "HOCH2CH=CHCH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "ClCC(Cl)CO", "name": "2,3-dichloropropan-1-ol", "condensed": "ClCH2CH(Cl)CH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "CC(Cl)=CCC(=O)O", "name": "4-chloropent-3-enoic acid", "condensed": "CH3C(Cl)=CHCH2COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+    {"smiles": "CC(I)C=C", "name": "3-iodobut-1-ene", "condensed": "CH3CH(I)CH=CH2", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Alkene double bond gets lower number if choice
+    {"smiles": "O=C(O)C=CC(=O)O", "name": "butenedioic acid", "condensed": "HOOCCH=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
+]
+
+def _make_problem(raw):
+    # Category/difficulty labels repeat across the bank; interning makes every copy the same object.
+    # Alternative names may be given as a single string or a list; they are stored as a tuple.
+    alternative_names = raw.get("alternative_names", ())
+    alternative_names = (alternative_names,) if isinstance(alternative_names, str) else tuple(alternative_names)
+    normalized_errors = {
+        normalize_answer(e["incorrect_name"]): e["explanation"]
+        for e in raw.get("common_errors", ()) if isinstance(e.get("incorrect_name"), str)
+    }
+    return Problem(**{
+        **raw,
+        "category": sys.intern(raw["category"]),
+        "difficulty": sys.intern(raw["difficulty"]),
+        "alternative_names": alternative_names,
+        "normalized_name": normalize_answer(raw["name"]),
+        "normalized_alternative_names": frozenset(
+            normalize_answer(alt) for alt in alternative_names if isinstance(alt, str)
+        ),
+        "normalized_errors": MappingProxyType(normalized_errors) if normalized_errors else _NO_ERRORS,
+    })
+
+practice_problems = tuple(_make_problem(p) for p in _RAW_PRACTICE_PROBLEMS)
+
+# Setup-page options, in order of first appearance in the bank
+ORDERED_CATEGORIES = tuple(dict.fromkeys(p.category for p in practice_problems if p.category))
+ORDERED_DIFFICULTIES = tuple(dict.fromkeys(p.difficulty for p in practice_problems if p.difficulty))
+MAX_PROBLEMS = len(practice_problems)
+
+# SMILES -> problem lookup, so code paths that only know the SMILES avoid scanning the bank
+PROBLEM_BY_SMILES = {p.smiles: p for p in practice_problems}
+
+# Inverted indexes (category/difficulty -> frozenset of problem indices) used to build the quiz pool
+_ids_by_category = {}
+_ids_by_difficulty = {}
+for _i, _p in enumerate(practice_problems):
+    _ids_by_category.setdefault(_p.category, []).append(_i)
+    _ids_by_difficulty.setdefault(_p.difficulty, []).append(_i)
+PROBLEM_IDS_BY_CATEGORY = {k: frozenset(v) for k, v in _ids_by_category.items()}
+PROBLEM_IDS_BY_DIFFICULTY = {k: frozenset(v) for k, v in _ids_by_difficulty.items()}
@@ -1,16 +1,16 @@
 # Step 1: Import necessary libraries
 import streamlit as st
-import base64 # Still used by original format_condensed_formula_html if needed, but not for st.image
-from io import BytesIO # Same as above
 import random
 import re
+from concurrent.futures import ThreadPoolExecutor
 from rdkit import Chem
-from rdkit.Chem import Draw
 from rdkit.Chem.AllChem import Compute2DCoords
-from rdkit.Chem.Draw import rdMolDraw2D # For MolDrawOptions
+from rdkit.Chem.Draw import rdMolDraw2D # For MolDrawOptions and the SVG drawer
 
 # For Google GenAI
+import httpx
 from google import genai
+from google.genai import types
 
 # --- Configuration & Initialization ---
 
@@ -20,9 +20,18 @@ from google import genai
 
 st.set_page_config(page_title="Chemistry Quiz", layout="wide", initial_sidebar_state="collapsed")
 
+@st.cache_resource
+def get_genai_client(api_key):
+    # One client shared by every session. The SDK already pools its httpx connections; the only
+    # change from httpx's defaults is keeping idle connections for 30 s instead of 5 s, so an
+    # explanation requested a few answers later can still reuse the open connection.
+    http_options = types.HttpOptions(client_args={'limits': httpx.Limits(keepalive_expiry=30)})
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+gemini_model_name = "gemini-2.0-flash" # Default, also used in the error message if reading secrets fails
 try:
     api_key_to_use = st.secrets.get("GENAI_API_KEY")
-    gemini_model_name = st.secrets.get("GENAI_MODEL_NAME", "gemini-2.0-flash") # Allow model override via secrets
+    gemini_model_name = st.secrets.get("GENAI_MODEL_NAME", gemini_model_name) # Allow model override via secrets
 
     if not api_key_to_use:
         # Fallback to your provided key if not in secrets - use with caution
@@ -40,7 +49,7 @@ try:
     # For this conversion, I will use the model name from secrets or the default.
     # Let's ensure `gemini_model_name` is used:
     
-    genai_model = genai.Client(api_key=api_key_to_use)
+    genai_model = get_genai_client(api_key_to_use)
     genai_service_available = True
     # Small test to see if model listing works (less intrusive than generating content on startup)
     # list(genai.list_models())
@@ -52,182 +61,11 @@ except Exception as e:
     genai_service_available = False
 
 
-# @title Question Bank (Keep as is)
-practice_problems = [
-    # === Straight-chain Alkane ===
-    {"smiles": "C", "name": "methane", "condensed": "CH4", "category": "Straight-chain Alkane", "difficulty": "Easy"},
-    {"smiles": "CC", "name": "ethane", "condensed": "CH3CH3", "category": "Straight-chain Alkane", "difficulty": "Easy"},
-    {"smiles": "CCC", "name": "propane", "condensed": "CH3CH2CH3", "category": "Straight-chain Alkane", "difficulty": "Easy"},
-    {"smiles": "CCCC", "name": "butane", "condensed": "CH3CH2CH2CH3", "category": "Straight-chain Alkane", "difficulty": "Medium"},
-    {"smiles": "CCCCC", "name": "pentane", "condensed": "CH3(CH2)3CH3", "category": "Straight-chain Alkane", "difficulty": "Medium"},
-    {"smiles": "CCCCCC", "name": "hexane", "condensed": "CH3(CH2)4CH3", "category": "Straight-chain Alkane", "difficulty": "Medium"},
-    {"smiles": "CCCCCCC", "name": "heptane", "condensed": "CH3(CH2)5CH3", "category": "Straight-chain Alkane", "difficulty": "Hard"},
-    {"smiles": "CCCCCCCC", "name": "octane", "condensed": "CH3(CH2)6CH3", "category": "Straight-chain Alkane", "difficulty": "Hard"},
-
-    # === Branched Alkane ===
-    {"smiles": "CC(C)C", "name": "2-methylpropane", "condensed": "CH3CH(CH3)CH3", "category": "Branched Alkane", "difficulty": "Easy", "alternative_names": ["methylpropane"]},
-    {"smiles": "CC(C)CC", "name": "2-methylbutane", "condensed": "CH3CH(CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
-    {"smiles": "CCC(C)CC", "name": "3-methylpentane", "condensed": "CH3CH2CH(CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
-    {"smiles": "CC(C)(C)C", "name": "2,2-dimethylpropane", "condensed": "C(CH3)4", "category": "Branched Alkane", "difficulty": "Medium"},
-    {"smiles": "CC(C)CCC", "name": "2-methylpentane", "condensed": "CH3CH(CH3)CH2CH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
-    {"smiles": "CC(C)C(C)C", "name": "2,3-dimethylbutane", "condensed": "CH3CH(CH3)CH(CH3)CH3", "category": "Branched Alkane", "difficulty": "Hard"},
-    {"smiles": "CCC(C)(C)CC", "name": "3,3-dimethylpentane", "condensed": "CH3CH2C(CH3)2CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
-    {"smiles": "CC(C)CC(C)C", "name": "2,4-dimethylpentane", "condensed": "CH3CH(CH3)CH2CH(CH3)CH3", "category": "Branched Alkane", "difficulty": "Hard"},
-    {"smiles": "CCC(CC)CCC", "name": "3-ethylhexane", "condensed": "CH3CH2CH2CH(CH2CH3)CH2CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
-    {"smiles": "CC(C)(C)CC(C)C", "name": "2,2,4-trimethylpentane", "condensed": "(CH3)3CCH2CH(CH3)CH3", "category": "Branched Alkane", "difficulty": "Hard"},
-    # === Branched Alkane (Continued) ===
-    {"smiles": "CC(C)(C)CC", "name": "2,2-dimethylbutane", "condensed": "(CH3)3CCH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
-    {"smiles": "CC(C)C(C)CC", "name": "2,3-dimethylpentane", "condensed": "CH3CH(CH3)CH(CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
-    {"smiles": "CCC(CC)CC", "name": "3-ethylpentane", "condensed": "CH3CH2CH(CH2CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Medium"},
-    {"smiles": "CC(C)C(CC)CC", "name": "3-ethyl-2-methylpentane", "condensed": "CH3CH(CH3)CH(CH2CH3)CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
-    {"smiles": "CCC(C)(C)C(CC)CCC", "name": "4-ethyl-3,3-dimethylheptane", "condensed": "CH3CH2C(CH3)2CH(CH2CH3)CH2CH2CH3", "category": "Branched Alkane", "difficulty": "Hard"},
-
-    # === Alkene === (Includes straight and branched)
-    {"smiles": "C=C", "name": "ethene", "condensed": "CH2=CH2", "category": "Alkene", "difficulty": "Easy"},
-    {"smiles": "CC=C", "name": "propene", "condensed": "CH3CH=CH2", "category": "Alkene", "difficulty": "Easy"},
-    {"smiles": "C=CCC", "name": "but-1-ene", "condensed": "CH2=CHCH2CH3", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "CC=CC", "name": "but-2-ene", "condensed": "CH3CH=CHCH3", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "C=CCCC", "name": "pent-1-ene", "condensed": "CH2=CHCH2CH2CH3", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "CC=CCC", "name": "pent-2-ene", "condensed": "CH3CH=CHCH2CH3", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "CC(C)C=C", "name": "3-methylbut-1-ene", "condensed": "CH3CH(CH3)CH=CH2", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "C=C(C)CC", "name": "2-methylbut-1-ene", "condensed": "CH2=C(CH3)CH2CH3", "category": "Alkene", "difficulty": "Hard"},
-    {"smiles": "CC=C(C)C", "name": "2-methylbut-2-ene", "condensed": "CH3CH=C(CH3)CH3", "category": "Alkene", "difficulty": "Hard"},
-    {"smiles": "CCC(C)=CCC", "name": "3-methylhex-3-ene", "condensed": "CH3CH2C(CH3)=CHCH2CH3", "category": "Alkene", "difficulty": "Hard"},
-    
-    # === Alkene (Continued) ===
-    {"smiles": "C=CCCCC", "name": "hex-1-ene", "condensed": "CH2=CHCH2CH2CH2CH3", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "CC=CCCC", "name": "hex-2-ene", "condensed": "CH3CH=CHCH2CH2CH3", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "CCC=CCC", "name": "hex-3-ene", "condensed": "CH3CH2CH=CHCH2CH3", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "C=CC(C)CC", "name": "3-methylpent-1-ene", "condensed": "CH2=CHCH(CH3)CH2CH3", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "CC=CC(C)C", "name": "4-methylpent-2-ene", "condensed": "CH3CH=CHCH(CH3)CH3", "category": "Alkene", "difficulty": "Medium"}, # Note: Could be (E) or (Z)
-    {"smiles": "CC(C)=C(C)C", "name": "2,3-dimethylbut-2-ene", "condensed": "CH3C(CH3)=C(CH3)CH3", "category": "Alkene", "difficulty": "Hard"},
-    
-    # Dienes
-    {"smiles": "C=CC=C", "name": "buta-1,3-diene", "condensed": "CH2=CHCH=CH2", "category": "Alkene", "difficulty": "Medium"},
-    {"smiles": "C=CC=CC", "name": "penta-1,3-diene", "condensed": "CH2=CHCH=CHCH3", "category": "Alkene", "difficulty": "Hard"}, # Note: CH3 end can be E/Z
-    {"smiles": "C=CCC=C", "name": "penta-1,4-diene", "condensed": "CH2=CHCH2CH=CH2", "category": "Alkene", "difficulty": "Hard"},
-    {"smiles": "C=C(C)C=C", "name": "2-methylbuta-1,3-diene", "condensed": "CH2=C(CH3)CH=CH2", "category": "Alkene", "difficulty": "Hard", "alternative_names": ["isoprene"]},
-    
-    # === Haloalkane ===
-    {"smiles": "C(Cl)", "name": "chloromethane", "condensed": "CH3Cl", "category": "Haloalkane", "difficulty": "Easy"},
-    {"smiles": "CCBr", "name": "bromoethane", "condensed": "CH3CH2Br", "category": "Haloalkane", "difficulty": "Easy"},
-    {"smiles": "CI", "name": "iodomethane", "condensed": "CH3I", "category": "Haloalkane", "difficulty": "Easy"}, # Added Iodo
-    {"smiles": "CF", "name": "fluoromethane", "condensed": "CH3F", "category": "Haloalkane", "difficulty": "Easy"},
-    {"smiles": "CCCI", "name": "1-iodopropane", "condensed": "CH3CH2CH2I", "category": "Haloalkane", "difficulty": "Medium"}, # Added Iodo
-    {"smiles": "CC(I)C", "name": "2-iodopropane", "condensed": "CH3CHICH3", "category": "Haloalkane", "difficulty": "Medium"}, # Added Iodo
-    {"smiles": "CCCCl", "name": "1-chloropropane", "condensed": "CH3CH2CH2Cl", "category": "Haloalkane", "difficulty": "Medium"},
-    {"smiles": "CC(Cl)C", "name": "2-chloropropane", "condensed": "CH3CHClCH3", "category": "Haloalkane", "difficulty": "Medium"},
-    {"smiles": "C(F)(F)F", "name": "trifluoromethane", "condensed": "CHF3", "category": "Haloalkane", "difficulty": "Medium"},
-    {"smiles": "CC(Br)CC", "name": "2-bromobutane", "condensed": "CH3CHBrCH2CH3", "category": "Haloalkane", "difficulty": "Medium"},
-    {"smiles": "ClCCBr", "name": "1-bromo-2-chloroethane", "condensed": "ClCH2CH2Br", "category": "Haloalkane", "difficulty": "Hard"},
-    {"smiles": "CC(Cl)(I)C", "name": "2-chloro-2-iodopropane", "condensed": "CH3C(Cl)(I)CH3", "category": "Haloalkane", "difficulty": "Hard"}, # Added Iodo
-    {"smiles": "FC(Cl)I", "name": "chlorofluoroiodomethane", "condensed": "CHFClI", "category": "Haloalkane", "difficulty": "Hard"}, # Added Iodo
-    
-    # === Haloalkane (Continued) ===
-    {"smiles": "CC(C)CBr", "name": "1-bromo-2-methylpropane", "condensed": "CH3CH(CH3)CH2Br", "category": "Haloalkane", "difficulty": "Medium"},
-    {"smiles": "CC(Cl)C(C)C", "name": "2-chloro-3-methylbutane", "condensed": "CH3CH(Cl)CH(CH3)CH3", "category": "Haloalkane", "difficulty": "Hard"},
-    {"smiles": "ClCC(C)(C)C", "name": "1-chloro-2,2-dimethylpropane", "condensed": "ClCH2C(CH3)3", "category": "Haloalkane", "difficulty": "Hard"},
-    {"smiles": "FC(Br)(Cl)C", "name": "1-bromo-1-chloro-1-fluoroethane", "condensed": "CH3CBrClF", "category": "Haloalkane", "difficulty": "Hard"}, # Halogens listed alphabetically
-    {"smiles": "CC(F)C(Cl)C", "name": "2-chloro-3-fluorobutane", "condensed": "CH3CH(F)CH(Cl)CH3", "category": "Haloalkane", "difficulty": "Hard"}, # Alphabetical chloro, then fluoro
-    
-    # === Alkanol ===
-    {"smiles": "CO", "name": "methanol", "condensed": "CH3OH", "category": "Alkanol", "difficulty": "Easy"},
-    {"smiles": "CCO", "name": "ethanol", "condensed": "CH3CH2OH", "category": "Alkanol", "difficulty": "Easy"},
-    {"smiles": "CCCO", "name": "propan-1-ol", "condensed": "CH3CH2CH2OH", "category": "Alkanol", "difficulty": "Medium"},
-    {"smiles": "CC(O)C", "name": "propan-2-ol", "condensed": "CH3CH(OH)CH3", "category": "Alkanol", "difficulty": "Medium"},
-    {"smiles": "CCCCO", "name": "butan-1-ol", "condensed": "CH3CH2CH2CH2OH", "category": "Alkanol", "difficulty": "Medium"},
-    {"smiles": "CC(O)CC", "name": "butan-2-ol", "condensed": "CH3CH(OH)CH2CH3", "category": "Alkanol", "difficulty": "Medium"},
-    {"smiles": "CC(C)(O)C", "name": "2-methylpropan-2-ol", "condensed": "(CH3)3COH", "category": "Alkanol", "difficulty": "Hard","alternative_names": ["methylpropan-2-ol"]},
-    {"smiles": "CC(C)CO", "name": "2-methylpropan-1-ol", "condensed": "CH3CH(CH3)CH2OH", "category": "Alkanol", "difficulty": "Hard","alternative_names": ["methylpropan-1-ol"]},
-    {"smiles": "CCC(O)CC", "name": "pentan-3-ol", "condensed": "CH3CH2CH(OH)CH2CH3", "category": "Alkanol", "difficulty": "Hard"},
-    {"smiles": "CC(O)C(O)C", "name": "butane-2,3-diol", "condensed": "CH3CH(OH)CH(OH)CH3", "category": "Alkanol", "difficulty": "Hard"},
-    # === Alkanol (Continued) ===
-    {"smiles": "CCCCCCO", "name": "hexan-1-ol", "condensed": "CH3(CH2)4CH2OH", "category": "Alkanol", "difficulty": "Medium"},
-    {"smiles": "CCCC(O)CC", "name": "hexan-3-ol", "condensed": "CH3CH2CH2CH(OH)CH2CH3", "category": "Alkanol", "difficulty": "Medium"},
-    {"smiles": "CC(C)CCO", "name": "3-methylbutan-1-ol", "condensed": "CH3CH(CH3)CH2CH2OH", "category": "Alkanol", "difficulty": "Hard"},
-    {"smiles": "CC(O)C(C)C", "name": "3-methylbutan-2-ol", "condensed": "CH3CH(OH)CH(CH3)CH3", "category": "Alkanol", "difficulty": "Hard"},
-    {"smiles": "OCCCO", "name": "propane-1,3-diol", "condensed": "HOCH2CH2CH2OH", "category": "Alkanol", "difficulty": "Medium"},
-    {"smiles": "OCC(O)CO", "name": "propane-1,2,3-triol", "condensed": "HOCH2CH(OH)CH2OH", "category": "Alkanol", "difficulty": "Hard", "alternative_names": ["glycerol"]},
-
-    # === Carboxylic Acid ===
-    {"smiles": "C(=O)O", "name": "methanoic acid", "condensed": "HCOOH", "category": "Carboxylic Acid", "difficulty": "Easy"},
-    {"smiles": "CC(=O)O", "name": "ethanoic acid", "condensed": "CH3COOH", "category": "Carboxylic Acid", "difficulty": "Easy"},
-    {"smiles": "CCC(=O)O", "name": "propanoic acid", "condensed": "CH3CH2COOH", "category": "Carboxylic Acid", "difficulty": "Medium"},
-    {"smiles": "CCCC(=O)O", "name": "butanoic acid", "condensed": "CH3CH2CH2COOH", "category": "Carboxylic Acid", "difficulty": "Medium"},
-    {"smiles": "CC(C)C(=O)O", "name": "2-methylpropanoic acid", "condensed": "CH3CH(CH3)COOH", "category": "Carboxylic Acid", "difficulty": "Medium"},
-    {"smiles": "CCCCC(=O)O", "name": "pentanoic acid", "condensed": "CH3CH2CH2CH2COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
-    {"smiles": "CC(C)CC(=O)O", "name": "3-methylbutanoic acid", "condensed": "CH3CH(CH3)CH2COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
-    {"smiles": "C(C(=O)O)C(=O)O", "name": "propanedioic acid", "condensed": "HOOCCH2COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
-    {"smiles": "CC(Cl)C(=O)O", "name": "2-chloropropanoic acid", "condensed": "CH3CH(Cl)COOH", "category": "Carboxylic Acid", "difficulty": "Hard"}, # Also Mixed
-    # === Carboxylic Acid (Continued) ===
-    {"smiles": "CCCCCC(=O)O", "name": "hexanoic acid", "condensed": "CH3(CH2)4COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
-    {"smiles": "CCC(CC)C(=O)O", "name": "2-ethylbutanoic acid", "condensed": "CH3CH2CH(CH2CH3)COOH", "category": "Carboxylic Acid", "difficulty": "Hard"},
-    {"smiles": "CC(C)(C)C(=O)O", "name": "2,2-dimethylpropanoic acid", "condensed": "(CH3)3CCOOH", "category": "Carboxylic Acid", "difficulty": "Hard", "alternative_names": ["pivalic acid"]},
-    {"smiles": "O=C(O)CCC(=O)O", "name": "butanedioic acid", "condensed": "HOOC(CH2)2COOH", "category": "Carboxylic Acid", "difficulty": "Hard", "alternative_names": ["succinic acid"]},
-    {"smiles": "O=C(O)CCCC(=O)O", "name": "pentanedioic acid", "condensed": "HOOC(CH2)3COOH", "category": "Carboxylic Acid", "difficulty": "Hard", },
-    
-    # === Mixed Functional Groups === (Focusing on combinations taught in S4, avoiding primary ketones)
-    # Alkanol + Alkene
-    {"smiles": "CC(O)C=C", "name": "but-3-en-2-ol", "condensed": "CH2=CHCH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "C=CCCO", "name": "but-3-en-1-ol", "condensed": "CH2=CHCH2CH2OH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "CC=CC(O)C", "name": "pent-3-en-2-ol", "condensed": "CH3CH=CHCH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "C=C(C)CO", "name": "2-methylprop-2-en-1-ol", "condensed": "CH2=C(CH3)CH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-
-    # Alkanol + Haloalkane
-    {"smiles": "OCCBr", "name": "2-bromoethanol", "condensed": "HOCH2CH2Br", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "ClCC(O)C", "name": "1-chloropropan-2-ol", "condensed": "ClCH2CH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "CC(O)CI", "name": "1-iodopropan-2-ol", "condensed": "ICH2CH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Added iodo
-    {"smiles": "C=CC(Br)CO", "name": "2-bromobut-3-en-1-ol", "condensed": "CH2=CHCH(Br)CH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-
-    # Alkene + Haloalkane
-    {"smiles": "C=CCl", "name": "chloroethene", "condensed": "CH2=CHCl", "category": "Mixed Functional Groups", "difficulty": "Easy"},
-    {"smiles": "BrC=C", "name": "bromoethene", "condensed": "CHBr=CH2", "category": "Mixed Functional Groups", "difficulty": "Easy"},
-    {"smiles": "C=CI", "name": "iodoethene", "condensed": "CH2=CHI", "category": "Mixed Functional Groups", "difficulty": "Easy"}, # Added iodo
-    {"smiles": "ClC=CCl", "name": "1,2-dichloroethene", "condensed": "CHCl=CHCl", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "C=CCBr", "name": "3-bromoprop-1-ene", "condensed": "CH2=CHCH2Br", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    # Haloalkene (More examples)
-    {"smiles": "ClC=CCCl", "name": "1,3-dichloropropene", "condensed": "ClCH=CHCH2Cl", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Can be E/Z
-    {"smiles": "C=C(Br)CBr", "name": "2,3-dibromoprop-1-ene", "condensed": "CH2=C(Br)CH2Br", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-
-    # Carboxylic Acid + Alkene (Unsaturated Acids)
-    {"smiles": "C=CC(=O)O", "name": "propenoic acid", "condensed": "CH2=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "CC=CC(=O)O", "name": "but-2-enoic acid", "condensed": "CH3CH=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "C=C(C)C(=O)O", "name": "2-methylpropenoic acid", "condensed": "CH2=C(CH3)COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-
-    # Carboxylic Acid + Haloalkane (Halo Acids)
-    {"smiles": "ClCC(=O)O", "name": "chloroethanoic acid", "condensed": "ClCH2COOH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "BrCCC(=O)O", "name": "3-bromopropanoic acid", "condensed": "BrCH2CH2COOH", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "CC(I)C(=O)O", "name": "2-iodopropanoic acid", "condensed": "CH3CH(I)COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Added iodo
-    {"smiles": "ClC(Cl)C(=O)O", "name": "2,2-dichloroethanoic acid", "condensed": "Cl2CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-
-    # Carboxylic Acid + Alkene + Halo
-    {"smiles": "ClC=CC(=O)O", "name": "3-chloropropenoic acid", "condensed": "ClCH=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard", "alternative_names": ["3-chloroprop-2-enoic acid"]}, # Can be E/Z
-    {"smiles": "C=C(Cl)C(=O)O", "name": "2-chloropropenoic acid", "condensed": "CH2=C(Cl)COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "BrCC=CC(=O)O", "name": "4-bromobut-2-enoic acid", "condensed": "BrCH2CH=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Can be E/Z
-
-    # Alkanol + Alkene + Halo (More examples)
-    {"smiles": "ClCC(O)C=C", "name": "1-chlorobut-3-en-2-ol", "condensed": "CH2=CHCH(OH)CH2Cl", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Typo in thought process, CH2=CHCH(OH)CH2Cl is correct for this name
-    {"smiles": "C=CCC(O)CI", "name": "5-iodopent-1-en-4-ol", "condensed": "CH2=CHCH2CH(OH)CH2I", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-
-    
-    # More challenging combinations without primary ketones
-    {"smiles": "ClC=CC(O)C", "name": "1-chlorobut-1-en-3-ol", "condensed": "ClCH=CHCH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "CC(Br)=CC(=O)O", "name": "3-bromobut-2-enoic acid", "condensed": "CH3C(Br)=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "OCC(Cl)C=C", "name": "2-chlorobut-3-en-1-ol", "condensed": "HOCH2CH(Cl)CH=CH2", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "C=C(Cl)C(C)(O)C", "name": "3-chloro-2-methylbut-3-en-2-ol", "condensed": "CH2=C(Cl)C(CH3)(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Corrected from before
-    {"smiles": "BrC(C)=CC(O)C", "name": "4-bromopent-3-en-2-ol", "condensed": "BrCH(CH3)CH=CHCH(OH)CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-
-    # Additional Mixed Examples
-    {"smiles": "CCC(O)C=C", "name": "pent-1-en-3-ol", "condensed": "CH3CH2CH(OH)CH=CH2", "category": "Mixed Functional Groups", "difficulty": "Medium"},
-    {"smiles": "CC(Cl)C(O)CC", "name": "2-chloropentan-3-ol", "condensed": "CH3CH(Cl)CH(OH)CH2CH3", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "C=C(Br)CCC(=O)O", "name": "4-bromopent-4-enoic acid", "condensed": "CH2=C(Br)CH2CH2COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "OCC=CCO", "name": "but-2-ene-1,4-diol", "condensed": "HOCH2CH=CHCH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "ClCC(Cl)CO", "name": "2,3-dichloropropan-1-ol", "condensed": "ClCH2CH(Cl)CH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "C=CC(Br)CO", "name": "2-bromobut-3-en-1-ol", "condensed": "CH2=CHCH(Br)CH2OH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "CC(Cl)=CCC(=O)O", "name": "4-chloropent-3-enoic acid", "condensed": "CH3C(Cl)=CHCH2COOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-    {"smiles": "CC(I)C=C", "name": "3-iodobut-1-ene", "condensed": "CH3CH(I)CH=CH2", "category": "Mixed Functional Groups", "difficulty": "Hard"}, # Alkene double bond gets lower number if choice
-    {"smiles": "O=C(O)C=CC(=O)O", "name": "butenedioic acid", "condensed": "HOOCCH=CHCOOH", "category": "Mixed Functional Groups", "difficulty": "Hard"},
-]
+# @title Question Bank (see question_bank.py)
+from question_bank import (
+    practice_problems, PROBLEM_BY_SMILES, PROBLEM_IDS_BY_CATEGORY, PROBLEM_IDS_BY_DIFFICULTY,
+    ORDERED_CATEGORIES, ORDERED_DIFFICULTIES, MAX_PROBLEMS, normalize_answer
+)
 
 
 # @title Validate structures (Adapted for Streamlit - console/optional UI output)
@@ -240,13 +78,13 @@ def validate_smiles_in_practice_problems(problems_list):
         return invalid_smiles_entries, validation_messages
 
     for i, problem in enumerate(problems_list):
-        smiles = problem.get('smiles')
-        name = problem.get('name', 'N/A')
+        smiles = problem.smiles
+        name = problem.name or 'N/A'
 
         if not smiles:
             msg = f"Error: Entry {i+1} (Name: '{name}') has no SMILES string."
             validation_messages.append(msg)
-            invalid_smiles_entries.append({**problem, "index": i+1, "error_type": "Missing SMILES"})
+            invalid_smiles_entries.append({**problem._asdict(), "index": i+1, "error_type": "Missing SMILES"})
             continue
 
         mol = Chem.MolFromSmiles(smiles, sanitize=True)
@@ -266,7 +104,7 @@ def validate_smiles_in_practice_problems(problems_list):
                    f"  SMILES: '{smiles}'\n"
                    f"  Detail: {error_detail}\n" + "-" * 20)
             validation_messages.append(msg)
-            invalid_smiles_entries.append({**problem, "index": i+1, "error_type": error_detail, "original_smiles": smiles})
+            invalid_smiles_entries.append({**problem._asdict(), "index": i+1, "error_type": error_detail, "original_smiles": smiles})
         elif mol.GetNumAtoms() == 0 and smiles.strip() != "":
             msg = (f"Warning: SMILES at Entry {i+1} (Name: '{name}') resulted in a molecule with 0 atoms.\n"
                    f"  SMILES: '{smiles}'\n" + "-" * 20)
@@ -280,9 +118,42 @@ def validate_smiles_in_practice_problems(problems_list):
     validation_messages.append("--- Validation Complete ---")
     return invalid_smiles_entries, validation_messages
 
+@st.cache_resource(show_spinner="Validating SMILES...")
+def get_practice_problems_validation():
+    # Validation log for the fixed bank; toggling the checkbox does not re-parse every SMILES
+    return validate_smiles_in_practice_problems(practice_problems)
+
 # --- Structure Generation Functions ---
-@st.cache_data
-def get_full_structure_image(mol_smiles):
+@st.cache_resource(max_entries=1024)
+def get_mol_from_smiles(mol_smiles):
+    # Callers must treat the cached Mol as read-only; the draw_* functions below
+    # parse their own copy because drawing mutates it.
+    return Chem.MolFromSmiles(mol_smiles)
+
+@st.cache_resource
+def get_parseable_problem_ids():
+    # Indices of bank problems whose SMILES RDKit can parse, so a bad entry never reaches a quiz
+    return frozenset(i for i, p in enumerate(practice_problems) if get_mol_from_smiles(p.smiles) is not None)
+
+# Drawn at the size they are displayed at, so fonts and line widths come out as configured
+FULL_STRUCTURE_IMAGE_SIZE = (400, 320)
+SKELETAL_STRUCTURE_IMAGE_SIZE = (300, 220)
+
+def draw_mol_svg(mol, size, draw_options=None):
+    # RDKit writes the SVG text directly, with no PIL image or PNG encode in between.
+    # st.image still wraps the text in a base64 data:image/svg+xml URI on each call,
+    # which is cheaper than the PNG path, where Streamlit re-opened the bytes with PIL.
+    drawer = rdMolDraw2D.MolDraw2DSVG(*size)
+    if draw_options is not None:
+        drawer.SetDrawOptions(draw_options)
+    rdMolDraw2D.PrepareAndDrawMolecule(drawer, mol, kekulize=True)
+    drawer.FinishDrawing()
+    svg = drawer.GetDrawingText()
+    return svg[svg.find('<svg'):] # Drop the XML declaration so the text is plain <svg> markup
+
+# The draw_* functions are plain RDKit work so they can run in worker threads;
+# Streamlit caching is added around them on the script thread.
+def draw_full_structure_svg(mol_smiles):
     mol = Chem.MolFromSmiles(mol_smiles)
     if not mol: return None
     mol_with_hs = Chem.AddHs(mol)
@@ -296,7 +167,6 @@ def get_full_structure_image(mol_smiles):
         draw_options.atomLabelFontSize = 15        # For atom labels like C, O, N
         draw_options.bondLineWidth = 1.5
         draw_options.padding = 0.1                 # Padding around the molecule
-        draw_options.explicitCarbonLabels = True   # Show 'C' for carbon atoms
         draw_options.addStereoAnnotation = True    # Show stereo info (e.g., wedge/dash)
         draw_options.includeAtomNumbers = False    # Don't show atom numbers by default
         draw_options.fixedBondLength = 40          # Adjust for visual spacing of bonds
@@ -311,78 +181,140 @@ def get_full_structure_image(mol_smiles):
         # Fallback to default options if setting a specific one fails
         draw_options = rdMolDraw2D.MolDrawOptions()
 
-
-    # This loop to set 'C' labels is good
+    # RDKit draws no label for carbon by default, so every carbon gets an explicit 'C' label
     for atom in mol_with_hs.GetAtoms():
         if atom.GetAtomicNum() == 6: # Carbon
-            atom.SetProp('atomLabel', 'C') # This ensures 'C' is displayed if explicitCarbonLabels is true
-
-    # Generate the image
-    # The 'options' parameter in MolToImage takes the MolDrawOptions object
-    img = Draw.MolToImage(
-        mol_with_hs, 
-        size=(550, 450), 
-        kekulize=True, 
-        options=draw_options # Pass the configured options object here
-    )
-    return img
-
-@st.cache_data
-def get_skeletal_structure_image(mol_smiles):
+            atom.SetProp('atomLabel', 'C')
+
+    # Generate the image with the configured options object
+    return draw_mol_svg(mol_with_hs, FULL_STRUCTURE_IMAGE_SIZE, draw_options)
+
+def draw_skeletal_structure_svg(mol_smiles):
     mol = Chem.MolFromSmiles(mol_smiles)
     if not mol: return None
     Compute2DCoords(mol)
-    img = Draw.MolToImage(mol, size=(350, 250))
-    return img
+    return draw_mol_svg(mol, SKELETAL_STRUCTURE_IMAGE_SIZE)
+
+_STRUCTURE_DRAWERS = {"Skeletal": draw_skeletal_structure_svg, "Full": draw_full_structure_svg}
+
+@st.cache_resource(max_entries=512, show_spinner=False)
+def render_structure_image(mol_smiles, view_type_str):
+    # On-demand SVG text per (SMILES, view) for molecules outside the precomputed bank.
+    # st.cache_resource returns the stored string on a hit without unpickling it.
+    return _STRUCTURE_DRAWERS[view_type_str](mol_smiles)
+
+def _draw_structure_images(mol_smiles):
+    return {view_type_str: draw(mol_smiles) for view_type_str, draw in _STRUCTURE_DRAWERS.items()}
+
+@st.cache_resource
+def start_structure_image_precompute():
+    # Draws every bank molecule in the background. The whole bank takes ~0.15 s, so one
+    # worker does it off the script thread while the student is still on the setup page;
+    # a lookup only waits for the molecule it needs. More workers measured no faster.
+    executor = ThreadPoolExecutor(max_workers=1)
+    # Smallest molecules first, so the quick drawings are ready soonest
+    futures = {smiles: executor.submit(_draw_structure_images, smiles) for smiles in sorted(PROBLEM_BY_SMILES, key=len)}
+    executor.shutdown(wait=False) # Queued drawings still run; the pool's threads exit once they finish
+    return futures
+
+def get_structure_image(mol_smiles, view_type_str):
+    images_future = start_structure_image_precompute().get(mol_smiles)
+    if images_future is None: # Not in the bank, draw on demand
+        return render_structure_image(mol_smiles, view_type_str)
+    return images_future.result()[view_type_str]
+
+_SUB_RE = re.compile(r'([A-Za-z)])(\d+)') # Atom/bracket followed by a count, e.g. CH3 or (CH2)4
 
 def format_condensed_formula_html(condensed_str):
     processed_str = condensed_str.replace('#', '≡')
-    formatted_with_subscripts = re.sub(r'([A-Za-z)])(\d+)', r'\1<sub>\2</sub>', processed_str)
+    formatted_with_subscripts = _SUB_RE.sub(r'\1<sub>\2</sub>', processed_str)
     return f"<div style='font-size: 1.8em; font-weight: bold; margin-top: 10px; margin-bottom: 10px; font-family: Arial, sans-serif; text-align: center;'>{formatted_with_subscripts}</div>"
 
-@st.cache_data
+# Responsive box for the condensed formula, filled with format_condensed_formula_html output
+_CONDENSED_BOX_TEMPLATE = (
+    '<div style="'
+    'width: 100%; '
+    'max-width: 350px; '   # Max desirable width
+    'min-height: 200px; '  # Minimum height to ensure visibility
+    'height: auto; '       # Let content define height
+    'display: flex; '
+    'justify-content: center; '
+    'align-items: center; '
+    'border: 1px solid #eee; '
+    'margin-left: auto; '  # Center the box if col is wider than max-width
+    'margin-right: auto; '
+    'background-color: #fff; '
+    'padding: 10px; '      # Add some padding inside the box
+    'box-sizing: border-box;'  # Ensure padding is included in width/height
+    '">{}</div>'
+)
+
+@st.cache_resource
+def get_condensed_formula_html_by_smiles():
+    # Boxed condensed-formula HTML for every bank molecule, keyed by SMILES
+    return {
+        smiles: _CONDENSED_BOX_TEMPLATE.format(format_condensed_formula_html(p.condensed))
+        for smiles, p in PROBLEM_BY_SMILES.items() if p.condensed
+    }
+
 def generate_condensed_formula(mol_smiles):
-    for p in practice_problems:
-        if p['smiles'] == mol_smiles and 'condensed' in p and p['condensed']:
-            return p['condensed']
-    return f"Condensed formula not found for SMILES: {mol_smiles}"
+    # Returns the ready-to-render boxed HTML, or None if the bank has no condensed formula for this SMILES
+    return get_condensed_formula_html_by_smiles().get(mol_smiles)
 
 # --- Session State Initialization ---
+# Per-quiz state, reset in a single update when a quiz is quit or restarted.
+# Values are immutable, so this one dict can be shared by every session.
+_QUIZ_STATE_DEFAULTS = {
+    'quiz_problems_list': (),
+    'problem_index': 0,
+    'total_problems_in_quiz': 0,
+    'current_score': 0,
+    'current_mol_smiles': None,
+    'current_correct_name': "",
+    'current_alternative_names': (),
+    'current_correct_name_norm': "", # normalize_answer() forms, precomputed on each Problem
+    'current_alternative_names_norm': frozenset(),
+    'submitted_student_answer_for_feedback': "", # Store the answer as it was when submitted
+    'is_current_problem_answered': False, 
+    'answer_submitted_and_locked': False, 
+    'is_current_problem_correct': False,
+    'feedback_message': "",
+    'ai_explanation': "",
+    'disable_answer_input': False,
+    'disable_formula_dropdown': False
+}
+
 def initialize_session_state():
     defaults = {
         'app_stage': 'setup',
         'selected_categories': [], 
         'selected_difficulties': [], 
         'num_problems_requested': 5,
-        'quiz_problems_list': [],
-        'problem_index': 0,
-        'total_problems_in_quiz': 0,
-        'current_score': 0,
-        'current_mol_smiles': None,
-        'current_correct_name': "",
-        'current_alternative_names': [],
         'student_answer': "", # This is the value bound to the text_input widget
-        'submitted_student_answer_for_feedback': "", # Store the answer as it was when submitted
-        'is_current_problem_answered': False, 
-        'answer_submitted_and_locked': False, 
-        'is_current_problem_correct': False,
-        'feedback_message': "",
-        'ai_explanation': "",
         'last_selected_formula_type': 'Skeletal',
-        'disable_formula_dropdown': False
+        **_QUIZ_STATE_DEFAULTS
     }
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
 
+def reset_quiz_state():
+    # The answer box is a widget, and its key cannot be assigned once the widget has been
+    # drawn in this run; dropping it lets initialize_session_state restore it on the rerun.
+    st.session_state.pop('student_answer', None)
+    st.session_state.update(_QUIZ_STATE_DEFAULTS)
+    st.session_state.app_stage = 'setup'
+
 initialize_session_state()
 
 # --- AI Explanation Function ---
-@st.cache_data(show_spinner="🤖 Asking AI for explanation...")
-def get_ai_nomenclature_explanation_st(student_answer, correct_iupac_name, smiles_string):
-    global genai_model, genai_service_available # Access the globally configured model
-    if not genai_service_available or not genai_model:
-        return "AI explanation service is not available."
+def stream_ai_nomenclature_explanation_st(student_answer, correct_iupac_name, smiles_string,
+                                          _client=genai_model, _model=gemini_model_name):
+    # Yields the explanation text as Gemini generates it, so the UI can show the first tokens immediately.
+    # The client and model name are bound as defaults (fast locals) rather than read as globals.
+    if _client is None:
+        yield "AI explanation service is not available."
+        return
 
     prompt = f"""
     You are an expert chemistry tutor evaluating the student's IUPAC nomenclature attempt for an organic compound.
@@ -412,41 +344,66 @@ def get_ai_nomenclature_explanation_st(student_answer, correct_iupac_name, smile
 
     If the student's answer is "{student_answer}" and the correct answer is "{correct_iupac_name}":
     """
-    try:
-        response = genai_model.models.generate_content(contents=prompt,model=gemini_model_name)
-        explanation = response.text
-        return extract_error_steps_and_comments(explanation)
-    except Exception as e:
-        st.error(f"Error calling Gemini API: {e}")
-        return f"Error calling Gemini API: {e}"
+    for chunk in _client.models.generate_content_stream(contents=prompt, model=_model):
+        if chunk.text:
+            yield chunk.text
+
+# Every "Step ..." or "Comment: ..." line, with an optional markdown bullet; other lines are skipped.
+# [^\S\n] is any whitespace except a newline, matching the per-line strip() of the old parser.
+_STEP_OR_COMMENT_RE = re.compile(
+    r'^[^\S\n]*(?:[*-][^\S\n]*)?((?:Step |Comment:)[^\n]*?)[^\S\n]*$',
+    re.MULTILINE,
+)
 
 def extract_error_steps_and_comments(text_block):
-    lines = text_block.strip().split('\n')
-    result_lines = []
-    last_step_was_error = False
-
-    for line in lines:
-        cleaned_line_for_processing = line.strip()
-        processed_line_content = re.sub(r'^[*-]\s*', '', cleaned_line_for_processing)
-
-        if processed_line_content.startswith("Step ") and processed_line_content.endswith("❌"):
-            result_lines.append(processed_line_content)
-            last_step_was_error = True
-        elif processed_line_content.startswith("Step "): # Reset if it's a step but not an error
-            last_step_was_error = False
-        elif processed_line_content.startswith("Comment:") and last_step_was_error:
-            result_lines.append(processed_line_content)
-            # Optional: Reset last_step_was_error here if a comment should only follow one error step
-            # last_step_was_error = False 
-
-    if not result_lines:
-        return "" 
-    
-    html_list_items = [f"<li>{res_line.replace('❌', '❌').replace('✅', '✅')}</li>" for res_line in result_lines]
+    # Keeps each step marked ❌ plus the comments that follow it, up to the next step
+    html_list_items = []
+    in_error_step = False
+    for line in _STEP_OR_COMMENT_RE.findall(text_block):
+        if line.startswith("Step "):
+            in_error_step = line.endswith("❌")
+            if in_error_step:
+                html_list_items.append(f"<li>{line}</li>")
+        elif in_error_step:
+            html_list_items.append(f"<li>{line}</li>")
+    if not html_list_items:
+        return ""
     return f"<ul>{''.join(html_list_items)}</ul>"
 
 # --- Streamlit UI Functions ---
 
+@st.cache_resource(ttl=3600, max_entries=1024, show_spinner=False)
+def get_ai_explanation_memo(student_answer, correct_iupac_name, smiles_string):
+    # Per-request holder shared by all sessions; filled once the streamed explanation completes,
+    # so an identical wrong answer is answered instantly instead of calling Gemini again
+    return {}
+
+def display_ai_explanation_stream_st(student_answer, correct_iupac_name, smiles_string):
+    memo = get_ai_explanation_memo(student_answer, correct_iupac_name, smiles_string)
+    if 'explanation' in memo:
+        if memo['explanation']:
+            st.markdown(memo['explanation'], unsafe_allow_html=True)
+        return memo['explanation']
+
+    # Shows the raw response while it streams, then swaps in the condensed list of incorrect steps
+    explanation_placeholder = st.empty()
+    try:
+        with explanation_placeholder.container():
+            full_text = st.write_stream(
+                stream_ai_nomenclature_explanation_st(student_answer, correct_iupac_name, smiles_string)
+            )
+    except Exception as e:
+        explanation_placeholder.error(f"Error calling Gemini API: {e}")
+        return f"Error calling Gemini API: {e}"
+
+    explanation = extract_error_steps_and_comments(full_text)
+    memo['explanation'] = explanation # Errors above are not memoized, so they are retried next time
+    if explanation:
+        explanation_placeholder.markdown(explanation, unsafe_allow_html=True)
+    else:
+        explanation_placeholder.empty()
+    return explanation
+
 def display_structure_st(view_type_str, smiles_str, structure_placeholder):
     with structure_placeholder:
         if not smiles_str:
@@ -455,46 +412,23 @@ def display_structure_st(view_type_str, smiles_str, structure_placeholder):
             return
 
         if view_type_str == "Skeletal":
-            pil_image = get_skeletal_structure_image(smiles_str)
-            if pil_image:
-                st.image(pil_image, caption="Skeletal Structure", use_column_width='auto')
+            structure_svg = get_structure_image(smiles_str, "Skeletal")
+            if structure_svg:
+                st.image(structure_svg, caption="Skeletal Structure", use_column_width='auto')
             else:
                 st.error("Could not generate skeletal structure.")
         elif view_type_str == "Full":
-            pil_image = get_full_structure_image(smiles_str)
-            if pil_image:
-                st.image(pil_image, caption="Full Structure", use_column_width='auto')
+            structure_svg = get_structure_image(smiles_str, "Full")
+            if structure_svg:
+                st.image(structure_svg, caption="Full Structure", use_column_width='auto')
             else:
                 st.error("Could not generate full structure.")
         elif view_type_str == "Condensed":
-            condensed_formula_raw = generate_condensed_formula(smiles_str)
-            if "not found" in condensed_formula_raw.lower(): # Make check case-insensitive
-                 st.warning(condensed_formula_raw)
+            formatted_html_string = generate_condensed_formula(smiles_str)
+            if formatted_html_string is None:
+                 st.warning(f"Condensed formula not found for SMILES: {smiles_str}")
             else:
-                formatted_html_string = format_condensed_formula_html(condensed_formula_raw)
-                # Responsive div for condensed formula
-                st.markdown(
-                    f"""
-                    <div style="
-                        width: 100%; 
-                        max-width: 350px; /* Max desirable width */
-                        min-height: 200px; /* Minimum height to ensure visibility */
-                        height: auto;    /* Let content define height */
-                        display: flex; 
-                        justify-content: center; 
-                        align-items: center; 
-                        border: 1px solid #eee; 
-                        margin-left: auto; /* Center the box if col is wider than max-width */
-                        margin-right: auto;
-                        background-color: #fff;
-                        padding: 10px; /* Add some padding inside the box */
-                        box-sizing: border-box; /* Ensure padding is included in width/height */
-                    ">
-                        {formatted_html_string}
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
+                st.markdown(formatted_html_string, unsafe_allow_html=True)
         else:
             st.error("Unknown view type selected.")
 
@@ -513,15 +447,11 @@ def handle_answer_submission_callback():
         correct_name = st.session_state.current_correct_name
         alternative_names = st.session_state.get('current_alternative_names', [])
 
-        processed_student_answer = current_submission.lower().strip().replace(" ", "").replace("-", "")
-        processed_correct_name = correct_name.lower().strip().replace(" ", "").replace("-", "")
-        processed_alt_names = [
-            alt.lower().strip().replace(" ", "").replace("-", "")
-            for alt in alternative_names if isinstance(alt, str)
-        ]
+        processed_student_answer = normalize_answer(current_submission)
+        processed_correct_name = st.session_state.current_correct_name_norm
 
         is_correct = (processed_student_answer == processed_correct_name or
-                      processed_student_answer in processed_alt_names)
+                      processed_student_answer in st.session_state.current_alternative_names_norm)
 
         st.session_state.answer_submitted_and_locked = True # Lock it
         st.session_state.disable_formula_dropdown = True
@@ -539,34 +469,30 @@ def handle_answer_submission_callback():
             # Best to clear only in go_to_next_problem_callback.
         else:
             st.session_state.is_current_problem_correct = False
-            feedback_parts = [
-                f"<p style='color:red; font-weight:bold; font-size:1.1em;'>Incorrect.</p>",
-                f"Your answer: <code>{current_submission}</code>", # Show what they submitted
-                f"The preferred IUPAC name is: <code>{correct_name}</code>"
-            ]
+            feedback_message = (
+                f"<p style='color:red; font-weight:bold; font-size:1.1em;'>Incorrect.</p>"
+                f"<br>Your answer: <code>{current_submission}</code>" # Show what they submitted
+                f"<br>The preferred IUPAC name is: <code>{correct_name}</code>"
+            )
             if alternative_names:
-                 feedback_parts.append(f"Other accepted name(s) include: <code>{', '.join(alternative_names)}</code>")
-            feedback_parts.append(f"<p></p>")
+                feedback_message += f"<br>Other accepted name(s) include: <code>{', '.join(alternative_names)}</code>"
+            feedback_message += "<br><p></p>"
             
             custom_explanation_found = False
             # ... (common error checking logic using current_submission / processed_student_answer)
             if 'quiz_problems_list' in st.session_state and \
                st.session_state.problem_index < len(st.session_state.quiz_problems_list):
                 problem_spec = st.session_state.quiz_problems_list[st.session_state.problem_index]
-                if 'common_errors' in problem_spec:
-                    for error_entry in problem_spec['common_errors']:
-                        if isinstance(error_entry.get('incorrect_name'), str):
-                            processed_incorrect_name = error_entry['incorrect_name'].lower().strip().replace(" ", "").replace("-", "")
-                            if processed_student_answer == processed_incorrect_name: # Check against the processed current submission
-                                feedback_parts.append(f"<hr><b>Explanation for your answer:</b><br>{error_entry['explanation']}")
-                                custom_explanation_found = True
-                                break
-            st.session_state.feedback_message = "<br>".join(feedback_parts)
+                # Incorrect names are normalized once when the bank is built, so this is a dict lookup
+                error_explanation = problem_spec.normalized_errors.get(processed_student_answer)
+                if error_explanation is not None:
+                    feedback_message += f"<br><hr><b>Explanation for your answer:</b><br>{error_explanation}"
+                    custom_explanation_found = True
+            st.session_state.feedback_message = feedback_message
             
             if not custom_explanation_found and genai_service_available:
-                st.session_state.ai_explanation = get_ai_nomenclature_explanation_st(
-                    current_submission, correct_name, st.session_state.current_mol_smiles
-                )
+                # None marks the explanation as pending; the quiz page streams it in on this rerun
+                st.session_state.ai_explanation = None
             else:
                 st.session_state.ai_explanation = ""
     
@@ -588,17 +514,21 @@ def go_to_next_problem_callback():
         load_current_problem_details()
 
 def setup_new_quiz_st():
-    filtered_problems = list(practice_problems) # Start with a copy
+    filtered_problems = practice_problems # Read-only tuple; a new list is built only if a filter applies
     
     # --- UPDATED FILTERING LOGIC ---
-    selected_cats = st.session_state.get('selected_categories', [])
-    selected_diffs = st.session_state.get('selected_difficulties', [])
-
-    if selected_cats: # If the list is not empty, apply category filter
-        filtered_problems = [p for p in filtered_problems if p.get('category') in selected_cats]
-    
-    if selected_diffs: # If the list is not empty, apply difficulty filter
-        filtered_problems = [p for p in filtered_problems if p.get('difficulty') in selected_diffs]
+    selected_cats = set(st.session_state.get('selected_categories') or ())
+    selected_diffs = set(st.session_state.get('selected_difficulties') or ())
+
+    parseable_ids = get_parseable_problem_ids()
+    if selected_cats or selected_diffs or len(parseable_ids) < len(practice_problems):
+        # Intersect the prebuilt index sets instead of scanning the whole bank
+        pool_ids = parseable_ids
+        if selected_cats: # If the list is not empty, apply category filter
+            pool_ids &= frozenset().union(*(PROBLEM_IDS_BY_CATEGORY.get(c, ()) for c in selected_cats))
+        if selected_diffs: # If the list is not empty, apply difficulty filter
+            pool_ids &= frozenset().union(*(PROBLEM_IDS_BY_DIFFICULTY.get(d, ()) for d in selected_diffs))
+        filtered_problems = [practice_problems[i] for i in sorted(pool_ids)]
 
     if not filtered_problems:
         st.warning(f"No problems found for the selected criteria. Trying to use problems from all available.")
@@ -611,7 +541,7 @@ def setup_new_quiz_st():
             # st.session_state.app_stage = 'setup' # Keep on setup page
             return # Stop quiz setup
         else: # This case means both selected_cats and selected_diffs were empty (i.e., "Any")
-            filtered_problems = list(practice_problems) # Fallback to all problems if initial selections were empty
+            filtered_problems = practice_problems # Fallback to all problems if initial selections were empty
     
     if not filtered_problems: # Should be caught above, but as a safeguard
         st.error("No practice problems available at all. Cannot start quiz.")
@@ -626,7 +556,9 @@ def setup_new_quiz_st():
         # st.session_state.app_stage = 'setup' # Keep on setup page
         return
 
-    st.session_state.quiz_problems_list = random.sample(filtered_problems, k=actual_num_problems)
+    # Sample indices, then materialize only the chosen problems
+    sampled_indices = random.sample(range(len(filtered_problems)), k=actual_num_problems)
+    st.session_state.quiz_problems_list = [filtered_problems[i] for i in sampled_indices]
     st.session_state.total_problems_in_quiz = actual_num_problems
     st.session_state.problem_index = 0
     st.session_state.current_score = 0
@@ -651,13 +583,15 @@ def load_current_problem_details():
 
     if st.session_state.problem_index < st.session_state.total_problems_in_quiz:
         problem_spec = st.session_state.quiz_problems_list[st.session_state.problem_index]
-        st.session_state.current_mol_smiles = problem_spec['smiles']
-        st.session_state.current_correct_name = problem_spec['name']
+        st.session_state.current_mol_smiles = problem_spec.smiles
+        st.session_state.current_correct_name = problem_spec.name
         
-        alt_names = problem_spec.get('alternative_names', [])
-        st.session_state.current_alternative_names = [alt_names] if isinstance(alt_names, str) else alt_names
+        # Alternative names and the normalized forms are prepared once when the bank is built
+        st.session_state.current_alternative_names = problem_spec.alternative_names
+        st.session_state.current_correct_name_norm = problem_spec.normalized_name
+        st.session_state.current_alternative_names_norm = problem_spec.normalized_alternative_names
         
-        mol = Chem.MolFromSmiles(st.session_state.current_mol_smiles)
+        mol = get_mol_from_smiles(st.session_state.current_mol_smiles)
         if not mol:
             st.error(f"Error loading SMILES: {st.session_state.current_mol_smiles} for problem {st.session_state.problem_index + 1}. This problem will be skipped.")
             # Mark problem as "answered" to enable Next button and prevent interaction
@@ -666,53 +600,38 @@ def load_current_problem_details():
             st.session_state.disable_formula_dropdown = True
             st.session_state.feedback_message = "<p style='color:orange; font-weight:bold;'>Problem Loading Error: This problem could not be loaded and will be skipped. Please click 'Next Problem'.</p>"
             st.session_state.current_mol_smiles = None # Ensure it's None so display_structure shows nothing or error
-            return # Exit, the UI will reflect this error state
+            return # Exit, the UI will reflect this error state. Defensive only: setup_new_quiz_st skips unparseable SMILES
     else:
         st.session_state.current_mol_smiles = None # No current problem if index is out of bounds
 
 # --- Main App Display Logic ---
 
 def display_setup_page_st():
+    start_structure_image_precompute() # Warm the structure images while the student picks options
     st.header("🧪 Organic Chemistry Nomenclature Practice Setup")
     st.markdown("---")
 
-    # Get unique categories and difficulties, maintaining original order of appearance
-    seen_categories_set = set()
-    # REMOVED "Any Category" from options, as empty multiselect implies "Any"
-    ordered_categories_options = [
-        p['category'] for p in practice_problems 
-        if p.get('category') and p['category'] not in seen_categories_set 
-        and not seen_categories_set.add(p['category'])
-    ]
-    
-    seen_difficulties_set = set()
-    # REMOVED "Any Difficulty" from options
-    ordered_difficulties_options = [
-        p['difficulty'] for p in practice_problems 
-        if p.get('difficulty') and p['difficulty'] not in seen_difficulties_set 
-        and not seen_difficulties_set.add(p['difficulty'])
-    ]
-    
-    max_possible_problems = len(practice_problems)
+    # Category/difficulty options and the problem count are computed once in question_bank.
+    # "Any" is not an option, as an empty multiselect implies "Any".
 
     cols_setup = st.columns([2,2,1])
     with cols_setup[0]:
       st.multiselect( # CHANGED to st.multiselect
           "Select Categories (leave blank for Any):", 
-          options=ordered_categories_options, 
+          options=ORDERED_CATEGORIES, 
           key="selected_categories" # Key matches session state
       )
     with cols_setup[1]:
       st.multiselect( # CHANGED to st.multiselect
           "Select Difficulties (leave blank for Any):", 
-          options=ordered_difficulties_options, 
+          options=ORDERED_DIFFICULTIES, 
           key="selected_difficulties" # Key matches session state
       )
     with cols_setup[2]:
       st.number_input(
           "Number of Problems:", 
           min_value=1, 
-          max_value=max_possible_problems, 
+          max_value=MAX_PROBLEMS, 
           key="num_problems_requested", 
           step=1
       )
@@ -737,14 +656,72 @@ def display_setup_page_st():
         - AI-powered explanations (using Google's Gemini) are provided for incorrect answers if available.
         """)
         if st.checkbox("Run SMILES Validation on Question Bank (for developers/debugging)"):
-            invalid_entries, validation_log_messages = validate_smiles_in_practice_problems(practice_problems)
+            invalid_entries, validation_log_messages = get_practice_problems_validation()
             st.text_area("SMILES Validation Log:", "\n".join(validation_log_messages), height=200, key="smiles_val_log")
             if invalid_entries:
                 st.error(f"{len(invalid_entries)} invalid SMILES entries found. Details in log above.")
                 
+@st.fragment
+def display_answer_fragment_st(displayed_problem_index):
+    # Submitting an answer only reruns this fragment, so the structure column is not redrawn.
+    # Moving to another problem (or to the results page) needs the whole page, so hand over to a full rerun.
+    # Values used more than once are bound to locals; callbacks (e.g. the form submit) have already run by this point
+    problem_index = st.session_state.problem_index
+    mol_smiles = st.session_state.current_mol_smiles
+    feedback_message = st.session_state.feedback_message
+    ai_explanation = st.session_state.ai_explanation
+
+    if st.session_state.app_stage != 'quiz' or problem_index != displayed_problem_index:
+        st.rerun()
+
+    st.markdown("#### Your Answer:")
+            
+    with st.form(key="answer_form"):
+        # The text_input is bound to st.session_state.student_answer.
+        # It will display whatever is in st.session_state.student_answer.
+        # It is NOT disabled when an answer is locked, to allow "Enter" for next.
+        st.text_input(
+            "Enter IUPAC Name:", 
+            key='student_answer', 
+            # Only disabled if no problem is loaded, otherwise it's active
+            # to receive the "Enter" key press for the form.
+            disabled=not mol_smiles,
+            # label_visibility="collapsed" # Optionally hide label if "Your Answer:" above is enough
+        )
+        
+        submit_button_label = "✔️ Submit Answer"
+        if st.session_state.answer_submitted_and_locked:
+            if problem_index + 1 >= st.session_state.total_problems_in_quiz:
+                submit_button_label = "🏁 Finish Quiz (Press Enter or Click)"
+            else:
+                submit_button_label = "➡️ Next Problem (Press Enter or Click)"
+
+        st.form_submit_button(
+            label=submit_button_label, 
+            use_container_width=True,
+            on_click=handle_answer_submission_callback
+        )
+    # Feedback is displayed based on st.session_state.feedback_message
+    # and st.session_state.submitted_student_answer_for_feedback if needed for display
+    if feedback_message:
+        st.markdown("#### Feedback:")
+        st.markdown(feedback_message, unsafe_allow_html=True)
+        if ai_explanation is None:
+            with st.expander("💡 AI Explanation (Beta)", expanded=True):
+                st.session_state.ai_explanation = display_ai_explanation_stream_st(
+                    st.session_state.submitted_student_answer_for_feedback,
+                    st.session_state.current_correct_name,
+                    mol_smiles
+                )
+        elif ai_explanation:
+            with st.expander("💡 AI Explanation (Beta)", expanded=not st.session_state.is_current_problem_correct):
+                st.markdown(ai_explanation, unsafe_allow_html=True)
+
 def display_quiz_page_st():
     st.header("🧠 IUPAC Nomenclature Quiz")
     # ... (progress bar and initial checks as before) ...
+    problem_index = st.session_state.problem_index
+    mol_smiles = st.session_state.current_mol_smiles
 
     col1, col2 = st.columns([2, 3])
 
@@ -754,77 +731,32 @@ def display_quiz_page_st():
             "Select Formula View:",
             options=['Skeletal', 'Full', 'Condensed'],
             key='last_selected_formula_type',
-            disabled=st.session_state.disable_formula_dropdown or not st.session_state.current_mol_smiles
+            disabled=st.session_state.disable_formula_dropdown or not mol_smiles
         )
         structure_placeholder_col1 = st.empty()
-        if st.session_state.current_mol_smiles:
-             display_structure_st(st.session_state.last_selected_formula_type, st.session_state.current_mol_smiles, structure_placeholder_col1)
-        elif st.session_state.problem_index < st.session_state.total_problems_in_quiz:
+        if mol_smiles:
+             display_structure_st(st.session_state.last_selected_formula_type, mol_smiles, structure_placeholder_col1)
+        elif problem_index < st.session_state.total_problems_in_quiz:
              structure_placeholder_col1.warning("Structure cannot be displayed for this problem.")
 
 
     with col2: # Assuming col2 is where the answer input is
-        st.markdown("#### Your Answer:")
-                
-        with st.form(key="answer_form"):
-            # The text_input is bound to st.session_state.student_answer.
-            # It will display whatever is in st.session_state.student_answer.
-            # It is NOT disabled when an answer is locked, to allow "Enter" for next.
-            st.text_input(
-                "Enter IUPAC Name:", 
-                key='student_answer', 
-                # Only disabled if no problem is loaded, otherwise it's active
-                # to receive the "Enter" key press for the form.
-                disabled=not st.session_state.current_mol_smiles,
-                # label_visibility="collapsed" # Optionally hide label if "Your Answer:" above is enough
-            )
-            
-            submit_button_label = "✔️ Submit Answer"
-            if st.session_state.answer_submitted_and_locked:
-                if st.session_state.problem_index + 1 >= st.session_state.total_problems_in_quiz:
-                    submit_button_label = "🏁 Finish Quiz (Press Enter or Click)"
-                else:
-                    submit_button_label = "➡️ Next Problem (Press Enter or Click)"
-
-            st.form_submit_button(
-                label=submit_button_label, 
-                use_container_width=True,
-                on_click=handle_answer_submission_callback
-            )
-        # Feedback is displayed based on st.session_state.feedback_message
-        # and st.session_state.submitted_student_answer_for_feedback if needed for display
-        if st.session_state.feedback_message:
-            st.markdown("#### Feedback:")
-            st.markdown(st.session_state.feedback_message, unsafe_allow_html=True)
-            if st.session_state.ai_explanation:
-                with st.expander("💡 AI Explanation (Beta)", expanded=not st.session_state.is_current_problem_correct):
-                    st.markdown(st.session_state.ai_explanation, unsafe_allow_html=True)
+        display_answer_fragment_st(problem_index)
     
     st.markdown("---")
     if st.button("New Quiz Setup / Quit Current Quiz", key="quit_quiz_btn_main"): # Changed key to avoid conflict
-        # ... (reset logic as before) ...
-        keys_to_clear_for_new_quiz = [
-            'quiz_problems_list', 'problem_index', 'total_problems_in_quiz', 
-            'current_score', 'current_mol_smiles', 'current_correct_name', 
-            'current_alternative_names', 'student_answer', 'is_current_problem_answered',
-            'answer_submitted_and_locked', # also reset this
-            'is_current_problem_correct', 'feedback_message', 'ai_explanation',
-            'disable_formula_dropdown'
-        ]
-        for key in keys_to_clear_for_new_quiz:
-            st.session_state.pop(key, None) 
-        
-        st.session_state.app_stage = 'setup'
-        initialize_session_state()
+        reset_quiz_state()
         st.rerun()
 
 def display_results_page_st():
     st.header("🏆 Quiz Over!")
     st.balloons()
     st.markdown("---")
-    st.subheader(f"Your final score is: {st.session_state.current_score} out of {st.session_state.total_problems_in_quiz}")
+    score = st.session_state.current_score
+    total = st.session_state.total_problems_in_quiz
+    st.subheader(f"Your final score is: {score} out of {total}")
     
-    percentage = (st.session_state.current_score / st.session_state.total_problems_in_quiz) * 100 if st.session_state.total_problems_in_quiz > 0 else 0
+    percentage = (score / total) * 100 if total > 0 else 0
     st.metric(label="Percentage", value=f"{percentage:.2f}%")
 
     if percentage == 100:
@@ -838,20 +770,7 @@ def display_results_page_st():
 
     st.markdown("---")
     if st.button("🔄 Start a New Quiz", type="primary", use_container_width=True):
-        # Similar reset as "Quit Quiz" to ensure clean state for new setup
-        keys_to_clear_for_restart = [
-            'quiz_problems_list', 'problem_index', 'total_problems_in_quiz', 
-            'current_score', 'current_mol_smiles', 'current_correct_name', 
-            'current_alternative_names', 'student_answer', 'is_current_problem_answered',
-            'is_current_problem_correct', 'feedback_message', 'ai_explanation',
-            'disable_answer_input', 'disable_formula_dropdown'
-        ]
-        for key in keys_to_clear_for_restart:
-            if key in st.session_state:
-                del st.session_state[key]
-        
-        st.session_state.app_stage = 'setup'
-        initialize_session_state() # Re-initialize
+        reset_quiz_state() # Same reset as "Quit Quiz" to ensure clean state for new setup
         st.rerun()
 
 # --- App Router ---